@@ -2,10 +2,26 @@
 import streamlit as st
 import pandas as pd
 import pydeck as pdk
+import numpy as np
 import datetime
+import difflib
+import gzip
+import hashlib
+import hmac
+import io
+import itertools
+import json
+import os
 import time
 from typing import Optional, List, Dict
 import random
+from collections import Counter, deque
+
+try:
+    import pyarrow as pa
+    import pyarrow.csv as pacsv
+except ImportError:  # pyarrow is optional; exports fall back to pandas
+    pa = None
 
 # ---------------- Page config & style ----------------
 st.set_page_config(
@@ -15,82 +31,23 @@ st.set_page_config(
     initial_sidebar_state="expanded"
 )
 
-st.markdown(
-    """
-    <style>
-    [data-testid="stAppViewContainer"] {
-        background: linear-gradient(135deg, #f5f7fa 0%, #c3cfe2 100%);
-        background-size: cover;
-        background-position: center;
-        background-attachment: fixed;
-        background-repeat: no-repeat;
-    }
-    [data-testid="stSidebar"] {
-        background-color: rgba(15, 15, 35, 0.95);
-        color: white;
-        backdrop-filter: blur(10px);
-    }
-    .main > div {
-        background-color: rgba(255, 255, 255, 0.92);
-        border-radius: 10px;
-        padding: 20px;
-        margin: 10px 0;
-    }
-    h1, h2, h3 { 
-        color: #d32f2f !important; 
-        text-shadow: 1px 1px 2px rgba(0,0,0,0.1);
-    }
-    div.stButton > button {
-        background-color: #d32f2f;
-        color: white;
-        font-weight: bold;
-        border-radius: 8px;
-        font-size: 16px;
-        border: 2px solid white;
-        transition: all 0.3s ease;
-    }
-    div.stButton > button:hover {
-        background-color: #b71c1c;
-        transform: scale(1.05);
-    }
-    .delete-button {
-        background-color: #b71c1c !important;
-        color: white !important;
-    }
-    .dashboard-card {
-        background-color: rgba(255, 255, 255, 0.95);
-        border-radius: 10px;
-        padding: 20px;
-        margin: 10px 0;
-        border-left: 5px solid #d32f2f;
-        box-shadow: 0 4px 6px rgba(0, 0, 0, 0.1);
-    }
-    .role-specific {
-        background-color: rgba(240, 248, 255, 0.9);
-        padding: 15px;
-        border-radius: 8px;
-        margin: 10px 0;
-        border: 1px solid #d32f2f;
-    }
-    .emergency-alert {
-        background: linear-gradient(135deg, #ff4444, #d32f2f);
-        color: white;
-        padding: 15px;
-        border-radius: 8px;
-        margin: 10px 0;
-        font-weight: bold;
-    }
-    .user-table {
-        font-size: 0.9em;
-    }
-    </style>
-    """,
-    unsafe_allow_html=True,
-)
+STYLE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "style.css")
+
+@st.cache_data(show_spinner=False)
+def load_css():
+    """Read the app stylesheet"""
+    with open(STYLE_PATH, encoding="utf-8") as f:
+        return f.read()
+
+# The <style> element must be emitted on every run; only the file read is cached
+st.markdown(f"<style>{load_css()}</style>", unsafe_allow_html=True)
 
 # ---------------- Constants ----------------
 CANTILAN_CENTER = [9.3355, 125.9769]
 
+# Upper bound for the residency year input
+CURRENT_YEAR = datetime.datetime.now().year
+
 EMERGENCY_CATEGORIES = [
     "Car Accident",
     "Flood",
@@ -110,22 +67,49 @@ HOTLINES = [
     {"Name": "Municipal Health Office", "Contact": "0917-333-3333", "Address": "Health Center, Cantilan, Surigao del Sur"},
 ]
 
+# Session state never shrinks on its own, so keep only the most recent
+# SOS logs / reports in memory and archive older ones to disk, one file
+# per browser session so sessions never see each other's records
+MAX_LOG_ENTRIES = 10000
+SOS_ARCHIVE_PATH = "sos_archive_{session}.jsonl.gz"
+REPORTS_ARCHIVE_PATH = "reports_archive_{session}.jsonl.gz"
+
+# Several hotlines share an office, so each address only needs resolving once
+HOTLINE_ADDRESSES = list(dict.fromkeys(hotline["Address"] for hotline in HOTLINES))
+HOTLINE_RADIUS_KM = 0.05
+
 # ---------------- Simplified Location Functions ----------------
-def generate_random_coords(base_coords, radius_km=0.1):
+def generate_random_coords(base_coords, radius_km=0.1, rng=random):
     """Generate random coordinates near base coordinates"""
-    lat = base_coords[0] + random.uniform(-radius_km/111, radius_km/111)
-    lon = base_coords[1] + random.uniform(-radius_km/111, radius_km/111)
+    lat = base_coords[0] + rng.uniform(-radius_km/111, radius_km/111)
+    lon = base_coords[1] + rng.uniform(-radius_km/111, radius_km/111)
     return [lat, lon]
 
-def get_distance(coord1, coord2):
-    """Calculate approximate distance between two coordinates in kilometers"""
-    try:
-        # Simple approximation for short distances
-        lat_diff = abs(coord1[0] - coord2[0]) * 111
-        lon_diff = abs(coord1[1] - coord2[1]) * 111
-        return (lat_diff**2 + lon_diff**2)**0.5
-    except:
-        return None
+def normalize_address(address: str) -> str:
+    """Normalize an address for lookups (lowercase, collapsed whitespace)"""
+    return " ".join(address.lower().split())
+
+# Landmarks with a known location, keyed by normalized name (e.g. "municipal hall")
+KNOWN_PLACES = {normalize_address(address.split(",")[0]): address for address in HOTLINE_ADDRESSES}
+
+def match_known_place(address: str) -> Optional[str]:
+    """Fuzzy-match the first part of an address against the known landmarks"""
+    matches = difflib.get_close_matches(normalize_address(address.split(",")[0]), KNOWN_PLACES, n=1, cutoff=0.8)
+    return KNOWN_PLACES[matches[0]] if matches else None
+
+@st.cache_data(ttl=86400, max_entries=10000, show_spinner=False)
+def geocode_address(address: str, radius_km=0.1):
+    """Get simulated coordinates for an address.
+
+    The generator is seeded with the normalized address, so the same address
+    always resolves to the same location (across reruns and restarts) without
+    any lookup table to persist. Addresses naming a known landmark, even with
+    a typo, resolve to that landmark's location.
+    """
+    place = match_known_place(address)
+    if place is not None:
+        address, radius_km = place, HOTLINE_RADIUS_KM
+    return generate_random_coords(CANTILAN_CENTER, radius_km, random.Random(normalize_address(address)))
 
 def get_address_from_coords(lat, lon):
     """Generate a descriptive address based on coordinates"""
@@ -146,17 +130,106 @@ def get_address_from_coords(lat, lon):
     
     return f"{area} {sector}, Cantilan, Surigao del Sur"
 
+@st.cache_resource(show_spinner=False)
+def get_hotline_coords():
+    """Get hotline locations by address (shared by all sessions, do not modify)"""
+    # Geocoding is deterministic, so every session can share one copy
+    return {address: geocode_address(address) for address in HOTLINE_ADDRESSES}
+
+@st.cache_resource(show_spinner=False)
+def get_hotline_positions():
+    """Get hotline (lats, lons) arrays in HOTLINES order, for vectorized distance queries (do not modify)"""
+    hotline_coords = get_hotline_coords()
+    lats = np.array([hotline_coords[hotline["Address"]][0] for hotline in HOTLINES])
+    lons = np.array([hotline_coords[hotline["Address"]][1] for hotline in HOTLINES])
+    return lats, lons
+
+EARTH_RADIUS_KM = 6371.0
+
+def haversine_vec(lat0, lon0, lats, lons):
+    """Calculate great-circle distances in kilometers from one point to arrays of points"""
+    lat0, lon0 = np.radians(lat0), np.radians(lon0)
+    lats, lons = np.radians(lats), np.radians(lons)
+    a = np.sin((lats - lat0) / 2) ** 2 + np.cos(lat0) * np.cos(lats) * np.sin((lons - lon0) / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(a))
+
+def nearest_hotline(lat, lon):
+    """Find the hotline closest to a point, as (hotline, distance in km)"""
+    distances = haversine_vec(lat, lon, *get_hotline_positions())
+    i = int(np.argmin(distances))
+    return HOTLINES[i], float(distances[i])
+
 # ---------------- Data Management (Session State) ----------------
+# Per-deployment secret for password hashing, taken from CANTILAN_ERS_SALT
+PASSWORD_KEY = hashlib.blake2b(os.environ.get("CANTILAN_ERS_SALT", "").encode(), digest_size=32).digest()
+SCRYPT_PARAMS = {"n": 2 ** 14, "r": 8, "p": 1}
+
+def hash_password(password: str, salt: Optional[bytes] = None) -> str:
+    """Hash a password with salted scrypt, stored as 'salt$hash'"""
+    if salt is None:
+        salt = os.urandom(16)
+    digest = hashlib.scrypt(password.encode(), salt=salt + PASSWORD_KEY, dklen=32, **SCRYPT_PARAMS)
+    return f"{salt.hex()}${digest.hex()}"
+
+def verify_password(password: str, stored: str) -> bool:
+    """Check a password against a stored 'salt$hash'"""
+    salt, _, _ = stored.partition("$")
+    return hmac.compare_digest(stored, hash_password(password, bytes.fromhex(salt)))
+
+def now_str():
+    """Current local time as 'YYYY-MM-DD HH:MM:SS'"""
+    return datetime.datetime.now().isoformat(sep=" ", timespec="seconds")
+
+def append_capped(records: deque, record: dict, archive_path: str) -> Optional[dict]:
+    """Append a record, archiving and returning the oldest one once the buffer is full"""
+    evicted = None
+    if len(records) == records.maxlen:
+        evicted = records[0]
+        # Fast level: this runs inline on the request that evicts the record
+        with gzip.open(archive_path.format(session=st.session_state.archive_id), "at",
+                       compresslevel=1, encoding="utf-8") as f:
+            f.write(json.dumps(evicted) + "\n")
+    records.append(record)
+    return evicted
+
 def initialize_session_state():
     """Initialize all session state variables"""
     if "users" not in st.session_state:
         st.session_state.users = []
     
+    # Lookup indexes over st.session_state.users
+    if "users_by_username" not in st.session_state:
+        st.session_state.users_by_username = {user["username"]: user for user in st.session_state.users}
+    
+    if "users_by_id" not in st.session_state:
+        st.session_state.users_by_id = {user["id"]: user for user in st.session_state.users}
+    
+    # Running counters for the dashboard metrics
+    if "role_counts" not in st.session_state:
+        st.session_state.role_counts = Counter(user["role"] for user in st.session_state.users)
+    
     if "sos_logs" not in st.session_state:
-        st.session_state.sos_logs = []
+        st.session_state.sos_logs = deque(maxlen=MAX_LOG_ENTRIES)
+    
+    # Names this session's archive files
+    if "archive_id" not in st.session_state:
+        st.session_state.archive_id = os.urandom(8).hex()
+    
+    if "active_sos_count" not in st.session_state:
+        st.session_state.active_sos_count = sum(not sos.get("handled") for sos in st.session_state.sos_logs)
     
     if "reports" not in st.session_state:
-        st.session_state.reports = []
+        st.session_state.reports = deque(maxlen=MAX_LOG_ENTRIES)
+    
+    # ID generators; IDs are never reused, even after deletes
+    if "next_user_id" not in st.session_state:
+        st.session_state.next_user_id = itertools.count(max((user["id"] for user in st.session_state.users), default=0) + 1)
+    
+    if "next_sos_id" not in st.session_state:
+        st.session_state.next_sos_id = itertools.count(max((sos["id"] for sos in st.session_state.sos_logs), default=0) + 1)
+    
+    if "next_report_id" not in st.session_state:
+        st.session_state.next_report_id = itertools.count(max((report["id"] for report in st.session_state.reports), default=0) + 1)
     
     if "current_user" not in st.session_state:
         st.session_state.current_user = None
@@ -164,59 +237,96 @@ def initialize_session_state():
     if "page" not in st.session_state:
         st.session_state.page = "home"
     
-    if "hotline_coordinates" not in st.session_state:
-        st.session_state.hotline_coordinates = {}
+    # DataFrame views of users / sos_logs / reports, rebuilt only after a write
+    if "users_df" not in st.session_state:
+        st.session_state.users_df = None
+    
+    if "sos_df" not in st.session_state:
+        st.session_state.sos_df = None
+    
+    if "reports_df" not in st.session_state:
+        st.session_state.reports_df = None
+    
+    # Display projections of the frames above, keyed by name
+    if "display_dfs" not in st.session_state:
+        st.session_state.display_dfs = {}
+
+def invalidate_user_caches():
+    """Drop the cached user frames; call once after any change to st.session_state.users"""
+    st.session_state.users_df = None
+    st.session_state.display_dfs.pop("users", None)
 
 def add_user(user: dict):
     """Add a new user to session state"""
-    user["id"] = len(st.session_state.users) + 1
-    user["registered_on"] = datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    user["id"] = next(st.session_state.next_user_id)
+    user["password"] = hash_password(user["password"])
+    user["registered_on"] = now_str()
     
     # Generate coordinates based on address or use random location
     if user.get("property_address"):
-        # Generate coordinates near Cantilan center with slight variations
-        user["latitude"], user["longitude"] = generate_random_coords(CANTILAN_CENTER)
-        st.toast(f"Location set for your address in Cantilan")
+        # Resolve the address to its (stable) simulated location
+        user["latitude"], user["longitude"] = geocode_address(user["property_address"])
+        st.toast(f"Auto-located: {user['property_address']} → {user['latitude']:.5f}, {user['longitude']:.5f}")
     else:
         # Use Cantilan center as fallback
         user["latitude"], user["longitude"] = CANTILAN_CENTER
     
     st.session_state.users.append(user)
+    st.session_state.users_by_username[user["username"]] = user
+    st.session_state.users_by_id[user["id"]] = user
+    st.session_state.role_counts[user["role"]] += 1
+    invalidate_user_caches()
 
 def get_user_by_username(username: str) -> Optional[dict]:
     """Find user by username"""
-    for user in st.session_state.users:
-        if user.get("username") == username:
-            return user
-    return None
+    return st.session_state.users_by_username.get(username)
 
 def validate_login(username: str, password: str) -> Optional[dict]:
     """Validate user login"""
-    for user in st.session_state.users:
-        if user.get("username") == username and user.get("password") == password:
-            return user
+    user = st.session_state.users_by_username.get(username)
+    if user and verify_password(password, user["password"]):
+        return user
     return None
 
 def get_all_users_df():
-    """Get all users as DataFrame"""
-    if not st.session_state.users:
-        return pd.DataFrame()
-    return pd.DataFrame(st.session_state.users)
+    """Get all users as DataFrame, without password hashes (shared between reruns, do not modify)"""
+    if st.session_state.users_df is None:
+        # Logins check the user dicts directly, so no frame ever needs the hashes
+        df = pd.DataFrame(st.session_state.users).drop(columns="password", errors="ignore")
+        if "registered_on" in df:
+            # Parse once here rather than on every admin render
+            df["registered_on"] = pd.to_datetime(df["registered_on"], errors="coerce", format="ISO8601")
+        # Few distinct values, so store them as categories
+        for col in ("role", "department"):
+            if col in df:
+                df[col] = df[col].astype("category")
+        st.session_state.users_df = df
+    return st.session_state.users_df
 
 def delete_user_by_id(user_id: int):
     """Delete user by ID"""
+    user = st.session_state.users_by_id.pop(user_id, None)
+    if user is not None:
+        st.session_state.users_by_username.pop(user["username"], None)
+        st.session_state.role_counts[user["role"]] -= 1
     st.session_state.users = [user for user in st.session_state.users if user.get("id") != user_id]
     # Also remove their SOS logs
-    st.session_state.sos_logs = [log for log in st.session_state.sos_logs if log.get("user_id") != user_id]
+    st.session_state.sos_logs = deque(
+        (log for log in st.session_state.sos_logs if log.get("user_id") != user_id),
+        maxlen=MAX_LOG_ENTRIES,
+    )
+    st.session_state.active_sos_count = sum(not sos.get("handled") for sos in st.session_state.sos_logs)
+    invalidate_user_caches()
+    st.session_state.sos_df = None
 
 def log_sos(user_id: int, user_name: str, lat: float, lon: float, note: str = "", category: Optional[str] = None):
     """Log a new SOS alert"""
-    sos_id = len(st.session_state.sos_logs) + 1
+    sos_id = next(st.session_state.next_sos_id)
     sos_record = {
         "id": sos_id,
         "user_id": user_id,
         "user_name": user_name,
-        "timestamp": datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+        "timestamp": now_str(),
         "lat": lat,
         "lon": lon,
         "note": note,
@@ -224,70 +334,76 @@ def log_sos(user_id: int, user_name: str, lat: float, lon: float, note: str = ""
         "category": category,
         "address": get_address_from_coords(lat, lon)
     }
-    st.session_state.sos_logs.append(sos_record)
+    evicted = append_capped(st.session_state.sos_logs, sos_record, SOS_ARCHIVE_PATH)
+    # An unhandled alert pushed out of the buffer can no longer be handled here
+    if evicted is not None and not evicted.get("handled"):
+        st.session_state.active_sos_count -= 1
+    st.session_state.active_sos_count += 1
+    st.session_state.sos_df = None
 
 def get_active_sos():
-    """Get all SOS logs as DataFrame"""
-    if not st.session_state.sos_logs:
-        return pd.DataFrame()
-    
-    # Ensure 'handled' column exists in all records
-    for sos in st.session_state.sos_logs:
-        if 'handled' not in sos:
-            sos['handled'] = False
-    
-    return pd.DataFrame(st.session_state.sos_logs)
+    """Get all SOS logs as DataFrame, newest first (shared between reruns, do not modify)"""
+    if st.session_state.sos_df is None:
+        # Logs are appended in time order, so reversing avoids a timestamp sort
+        df = pd.DataFrame(reversed(st.session_state.sos_logs))
+        
+        # Records without a 'handled' flag count as active
+        df["handled"] = df["handled"].fillna(False).astype(bool) if "handled" in df else False
+        st.session_state.sos_df = df
+    return st.session_state.sos_df
 
 def mark_sos_handled(sos_id: int):
     """Mark an SOS as handled"""
     for sos in st.session_state.sos_logs:
         if sos.get("id") == sos_id:
+            if not sos.get("handled"):
+                st.session_state.active_sos_count -= 1
             sos["handled"] = True
+            st.session_state.sos_df = None
             break
 
 def add_report(reporter_id: int, reporter_name: str, category: str, description: str, lat: float, lon: float):
     """Add a new official report"""
-    report_id = len(st.session_state.reports) + 1
+    report_id = next(st.session_state.next_report_id)
     report = {
         "id": report_id,
         "reporter_id": reporter_id,
         "reporter_name": reporter_name,
-        "timestamp": datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+        "timestamp": now_str(),
         "category": category,
         "description": description,
         "lat": lat,
         "lon": lon,
         "address": get_address_from_coords(lat, lon)
     }
-    st.session_state.reports.append(report)
+    append_capped(st.session_state.reports, report, REPORTS_ARCHIVE_PATH)
+    st.session_state.reports_df = None
 
 def get_reports_df():
-    """Get all reports as DataFrame"""
-    if not st.session_state.reports:
-        return pd.DataFrame()
-    return pd.DataFrame(st.session_state.reports)
-
-def get_hotline_coordinates():
-    """Get coordinates for all hotlines"""
-    if not st.session_state.hotline_coordinates:
-        for i, hotline in enumerate(HOTLINES):
-            address_key = hotline["Address"]
-            # Generate coordinates with slight variations
-            st.session_state.hotline_coordinates[address_key] = generate_random_coords(CANTILAN_CENTER, 0.05)
-    return st.session_state.hotline_coordinates
+    """Get all reports as DataFrame (shared between reruns, do not modify)"""
+    if st.session_state.reports_df is None:
+        df = pd.DataFrame(st.session_state.reports)
+        if "category" in df:
+            df["category"] = df["category"].astype("category")
+        st.session_state.reports_df = df
+    return st.session_state.reports_df
+
+def get_display_df(name: str, source, build):
+    """Get build(source), reused until the source frame is rebuilt (do not modify)"""
+    cached = st.session_state.display_dfs.get(name)
+    if cached is None or cached[0] is not source:
+        cached = st.session_state.display_dfs[name] = (source, build(source))
+    return cached[1]
 
 # ---------------- Initialize Session State ----------------
 initialize_session_state()
 
+# Older Streamlit releases only ship experimental_rerun
+RERUN = getattr(st, "rerun", None) or getattr(st, "experimental_rerun", lambda: None)
+
 def safe_rerun():
     """Safely rerun the app"""
-    try:
-        st.rerun()
-    except:
-        try:
-            st.experimental_rerun()
-        except:
-            pass
+    RERUN()
 
 # ---------------- UI: sidebar navigation ----------------
 with st.sidebar:
@@ -315,55 +431,57 @@ with st.sidebar:
         st.markdown(f"**Total Registered Users:** {len(st.session_state.users)}")
 
 # ---------------- Pages ----------------
-def page_home():
-    st.title("🚨 Cantilan Emergency Response System")
-    st.markdown("Use the sidebar to login or sign up. If you're already signed in, you'll be redirected to your dashboard.")
-    
-    # Show quick stats
-    if st.session_state.users:
-        col1, col2, col3, col4 = st.columns(4)
-        df_users = get_all_users_df()
-        role_counts = df_users['role'].value_counts()
-        
-        with col1:
-            st.metric("Total Users", len(st.session_state.users))
-        with col2:
-            st.metric("Citizens", role_counts.get('user', 0))
-        with col3:
-            st.metric("Responders", role_counts.get('rescuer', 0))
-        with col4:
-            # Safe count of active alerts
-            df_sos = get_active_sos()
-            if not df_sos.empty and 'handled' in df_sos.columns:
-                active_alerts = len(df_sos[df_sos['handled'] == False])
-            else:
-                active_alerts = 0
-            st.metric("Active Alerts", active_alerts)
-    
-    st.markdown("### 📍 Cantilan Map (Reference)")
-    
-    # Get hotline coordinates
-    hotline_coords = get_hotline_coordinates()
-    
-    # Create map data for hotlines
-    map_data = []
-    for i, hotline in enumerate(HOTLINES):
-        address_key = hotline["Address"]
-        if address_key in hotline_coords:
-            lat, lon = hotline_coords[address_key]
-        else:
-            # Add slight variations to coordinates to show multiple locations
-            lat = CANTILAN_CENTER[0] + (i * 0.001)
-            lon = CANTILAN_CENTER[1] + (i * 0.001)
-        
-        map_data.append({
+# emg.py is re-executed on every rerun, so derived constants are built once
+# per process through Streamlit's caches rather than at module level
+@st.cache_resource(show_spinner=False)
+def get_hotlines_df():
+    """Get the hotlines table as DataFrame (shared by all sessions, do not modify)"""
+    return pd.DataFrame(HOTLINES)
+
+@st.cache_resource(show_spinner=False)
+def get_emergency_type_options():
+    """Get the SOS emergency type choices, blank first (shared by all sessions, do not modify)"""
+    return [""] + EMERGENCY_CATEGORIES
+
+@st.cache_resource(show_spinner=False)
+def get_hotline_lines():
+    """Get the quick-contact lines for the citizen dashboard (shared by all sessions, do not modify)"""
+    return [f"**{hotline['Name']}:** {hotline['Contact']}" for hotline in HOTLINES[:2]]
+
+@st.cache_resource(show_spinner=False)
+def get_hotline_map_df():
+    """Get the hotline markers for dashboard maps (shared by all sessions, do not modify)"""
+    hotline_coords = get_hotline_coords()
+    return pd.DataFrame([
+        {
+            "latitude": hotline_coords[hotline["Address"]][0],
+            "longitude": hotline_coords[hotline["Address"]][1],
+            "name": hotline["Name"],
+            "type": "hotline",
+            "color": [255, 165, 0, 180]
+        }
+        for hotline in HOTLINES if hotline["Address"] in hotline_coords
+    ])
+
+@st.cache_data(show_spinner=False)
+def build_home_map_df(hotline_coords_items):
+    """Build the home map points (hotlines + Cantilan center) with their colors and radii"""
+    hotline_coords = dict(hotline_coords_items)
+    map_data = [
+        {
             "name": hotline["Name"],
             "contact": hotline["Contact"],
             "address": hotline["Address"],
             "lat": lat,
             "lon": lon,
-            "type": "hotline"
-        })
+            "type": "hotline",
+            "color": [255, 69, 0, 200],
+            "radius": 150
+        }
+        for i, hotline in enumerate(HOTLINES)
+        # Unresolved addresses get slight variations around the center to show multiple locations
+        for lat, lon in [hotline_coords.get(hotline["Address"], (CANTILAN_CENTER[0] + i * 0.001, CANTILAN_CENTER[1] + i * 0.001))]
+    ]
     
     # Add Cantilan center point
     map_data.append({
@@ -372,10 +490,17 @@ def page_home():
         "address": "Cantilan, Surigao del Sur",
         "lat": CANTILAN_CENTER[0],
         "lon": CANTILAN_CENTER[1],
-        "type": "center"
+        "type": "center",
+        "color": [0, 100, 255, 150],
+        "radius": 100
     })
     
-    df_locs = pd.DataFrame(map_data)
+    return pd.DataFrame(map_data)
+
+@st.cache_resource(show_spinner=False)
+def build_home_deck(hotline_coords_items):
+    """Build the home page reference map (shared by all sessions, do not modify)"""
+    df_locs = build_home_map_df(hotline_coords_items)
     
     # Configure pydeck map
     view_state = pdk.ViewState(
@@ -385,14 +510,6 @@ def page_home():
         pitch=0
     )
     
-    # Color points based on type
-    df_locs['color'] = df_locs['type'].apply(
-        lambda x: [255, 69, 0, 200] if x == "hotline" else [0, 100, 255, 150]
-    )
-    df_locs['radius'] = df_locs['type'].apply(
-        lambda x: 150 if x == "hotline" else 100
-    )
-    
     layer = pdk.Layer(
         "ScatterplotLayer",
         data=df_locs,
@@ -419,11 +536,33 @@ def page_home():
         tooltip=tooltip
     )
     
-    st.pydeck_chart(deck)
+    return deck
+
+def page_home():
+    st.title("🚨 Cantilan Emergency Response System")
+    st.markdown("Use the sidebar to login or sign up. If you're already signed in, you'll be redirected to your dashboard.")
+    
+    # Show quick stats
+    if st.session_state.users:
+        col1, col2, col3, col4 = st.columns(4)
+        role_counts = st.session_state.role_counts
+        
+        with col1:
+            st.metric("Total Users", len(st.session_state.users))
+        with col2:
+            st.metric("Citizens", role_counts["user"])
+        with col3:
+            st.metric("Responders", role_counts["rescuer"])
+        with col4:
+            st.metric("Active Alerts", st.session_state.active_sos_count)
+    
+    st.markdown("### 📍 Cantilan Map (Reference)")
+    
+    st.pydeck_chart(build_home_deck(tuple(sorted(get_hotline_coords().items()))))
     
     
     st.markdown("### 📞 Emergency Hotlines")
-    st.table(pd.DataFrame(HOTLINES))
+    st.table(get_hotlines_df())
 
 def page_about():
     st.header("About")
@@ -496,280 +635,208 @@ def page_signup_role():
             st.session_state.page = "signup_admin"
             safe_rerun()
 
-def page_signup_user():
-    st.header("👤 Citizen Registration")
-    st.markdown("Register as a resident to access emergency services")
-    
-    # Registration form
-    with st.form("signup_user", clear_on_submit=True):
-        st.subheader("Personal Information")
-        col1, col2 = st.columns(2)
-        with col1:
-            username = st.text_input("Username *")
-            password = st.text_input("Password *", type="password")
-            name = st.text_input("Full Name *")
-            age = st.number_input("Age *", 1, 120, 30)
-            gender = st.selectbox("Gender *", ["Male", "Female", "Other"])
-        
-        with col2:
-            mobile = st.text_input("Mobile Number *")
-            work = st.text_input("Occupation")
-            family_members = st.number_input("Family Members", 1, 50, 1)
-        
-        st.subheader("Residence Information")
-        col3, col4 = st.columns(2)
-        with col3:
-            property_address = st.text_area("Property Address (Barangay, Street) *", 
-                                      placeholder="e.g., Poblacion, Cantilan, Surigao del Sur")
-            specific_address = st.text_input("Specific Address / Landmark")
-        with col4:
-            property_size = st.text_input("Property Size (e.g., 150 sqm)")
-            year_residency = st.number_input("Year of Residency", 1900, datetime.datetime.now().year, 2020)
-        
-        st.markdown("**Required fields*")
-        submitted = st.form_submit_button("Create Citizen Account")
-        
-        if submitted:
-            if not all([username, password, name, mobile, property_address]):
-                st.error("Please fill all required fields (*)")
-            elif get_user_by_username(username):
-                st.error("Username already exists. Pick another.")
-            else:
-                user = {
-                    "role": "user",
-                    "username": username,
-                    "password": password,
-                    "name": name,
-                    "age": age,
-                    "gender": gender,
-                    "mobile": mobile,
-                    "position": None,
-                    "work": work,
-                    "family_members": family_members,
-                    "property_address": property_address,
-                    "specific_address": specific_address,
-                    "property_size": property_size,
-                    "year_residency": year_residency,
-                    "specialization": None,
-                    "equipment": None,
-                    "department": None,
-                    "clearance_level": None,
-                    "admin_privileges": None,
-                }
-                add_user(user)
-                st.success("Citizen account created successfully! You can now log in.")
-                time.sleep(2)
-                st.session_state.page = "login"
-                safe_rerun()
+# Keys of a user record; fields a role's form doesn't ask for stay None
+USER_FIELDS = [
+    "role", "username", "password", "name", "age", "gender", "mobile", "position", "work",
+    "family_members", "property_address", "specific_address", "property_size", "year_residency",
+    "specialization", "equipment", "department", "clearance_level", "admin_privileges",
+]
 
-def page_signup_rescuer():
-    st.header("🚑 Emergency Responder Registration")
-    st.markdown("Register as a first responder or emergency personnel")
-    
-    # Registration form
-    with st.form("signup_rescuer", clear_on_submit=True):
-        st.subheader("Personal Information")
-        col1, col2 = st.columns(2)
-        with col1:
-            username = st.text_input("Username *")
-            password = st.text_input("Password *", type="password")
-            name = st.text_input("Full Name *")
-            mobile = st.text_input("Mobile Number *")
-        
-        with col2:
-            position = st.selectbox("Position/Rank *", 
-                ["Police Officer", "Firefighter", "Paramedic", "EMT", "Doctor", "Nurse", 
-                 "Search & Rescue", "Volunteer", "Other"])
-            specialization = st.text_input("Specialization (e.g., Water Rescue, Medical)")
-        
-        st.subheader("Organization Details")
-        col3, col4 = st.columns(2)
-        with col3:
-            base_address = st.text_input("Base Address *", placeholder="e.g., Municipal Hall, Cantilan")
-            work = st.text_input("Organization/Unit *", placeholder="e.g., BFP Cantilan, PNP Station")
-            department = st.text_input("Department/Section")
-        with col4:
-            equipment = st.text_area("Equipment/Skills", placeholder="e.g., First Aid, Fire Truck, Boat")
-            clearance_level = st.selectbox("Clearance Level", 
-                ["Basic", "Intermediate", "Advanced", "Command", "Not Specified"])
-        
-        st.markdown("**Required fields*")
-        submitted = st.form_submit_button("Create Responder Account")
-        
-        if submitted:
-            if not all([username, password, name, mobile, position, work, base_address]):
-                st.error("Please fill all required fields (*)")
-            elif get_user_by_username(username):
-                st.error("Username already exists. Pick another.")
-            else:
-                user = {
-                    "role": "rescuer",
-                    "username": username,
-                    "password": password,
-                    "name": name,
-                    "age": None,
-                    "gender": None,
-                    "mobile": mobile,
-                    "position": position,
-                    "work": work,
-                    "family_members": None,
-                    "property_address": base_address,
-                    "specific_address": None,
-                    "property_size": None,
-                    "year_residency": None,
-                    "specialization": specialization,
-                    "equipment": equipment,
-                    "department": department,
-                    "clearance_level": clearance_level,
-                    "admin_privileges": None,
-                }
-                add_user(user)
-                st.success("Responder account created successfully! You can now log in.")
-                time.sleep(2)
-                st.session_state.page = "login"
-                safe_rerun()
+# Signup form fields: (user key, widget, label, widget kwargs)
+USERNAME_FIELD = ("username", st.text_input, "Username *", {})
+PASSWORD_FIELD = ("password", st.text_input, "Password *", {"type": "password"})
+NAME_FIELD = ("name", st.text_input, "Full Name *", {})
+MOBILE_FIELD = ("mobile", st.text_input, "Mobile Number *", {})
 
-def page_signup_government():
-    st.header("🏛️ Government Official Registration")
-    st.markdown("Register as a government officer or department representative")
-    
-    # Registration form
-    with st.form("signup_government", clear_on_submit=True):
-        st.subheader("Official Information")
-        col1, col2 = st.columns(2)
-        with col1:
-            username = st.text_input("Username *")
-            password = st.text_input("Password *", type="password")
-            name = st.text_input("Full Name *")
-            mobile = st.text_input("Mobile Number *")
-        
-        with col2:
-            position = st.text_input("Official Position *", placeholder="e.g., DRRMO Officer, Mayor, Councilor")
-            department = st.text_input("Department/Office *", placeholder="e.g., Mayor's Office, DRRMO, Health Office")
-        
-        st.subheader("Government Details")
-        col3, col4 = st.columns(2)
-        with col3:
-            office_address = st.text_input("Office Address *", placeholder="e.g., Municipal Hall, Cantilan")
-            work = st.text_input("Specific Unit/Section", placeholder="e.g., Operations, Planning, Administration")
-            clearance_level = st.selectbox("Security Clearance", 
-                ["Public", "Internal", "Confidential", "Restricted", "Secret"])
-        with col4:
-            specialization = st.text_area("Responsibilities/Expertise", 
-                placeholder="e.g., Disaster Response, Health Services, Infrastructure")
-        
-        st.markdown("**Required fields*")
-        submitted = st.form_submit_button("Create Government Account")
-        
-        if submitted:
-            if not all([username, password, name, mobile, position, department, office_address]):
-                st.error("Please fill all required fields (*)")
-            elif get_user_by_username(username):
-                st.error("Username already exists. Pick another.")
-            else:
-                user = {
-                    "role": "government",
-                    "username": username,
-                    "password": password,
-                    "name": name,
-                    "age": None,
-                    "gender": None,
-                    "mobile": mobile,
-                    "position": position,
-                    "work": work,
-                    "family_members": None,
-                    "property_address": office_address,
-                    "specific_address": None,
-                    "property_size": None,
-                    "year_residency": None,
-                    "specialization": specialization,
-                    "equipment": None,
-                    "department": department,
-                    "clearance_level": clearance_level,
-                    "admin_privileges": None,
-                }
-                add_user(user)
-                st.success("Government account created successfully! You can now log in.")
-                time.sleep(2)
-                st.session_state.page = "login"
-                safe_rerun()
+# Signup form layout per role: sections are (subheader, left column, right column);
+# a section without a right column is rendered full width
+ROLE_CONFIGS = {
+    "user": {
+        "header": "👤 Citizen Registration",
+        "intro": "Register as a resident to access emergency services",
+        "account": "Citizen",
+        "sections": [
+            ("Personal Information", [
+                USERNAME_FIELD,
+                PASSWORD_FIELD,
+                NAME_FIELD,
+                ("age", st.number_input, "Age *", {"min_value": 1, "max_value": 120, "value": 30}),
+                ("gender", st.selectbox, "Gender *", {"options": ["Male", "Female", "Other"]}),
+            ], [
+                MOBILE_FIELD,
+                ("work", st.text_input, "Occupation", {}),
+                ("family_members", st.number_input, "Family Members", {"min_value": 1, "max_value": 50, "value": 1}),
+            ]),
+            ("Residence Information", [
+                ("property_address", st.text_area, "Property Address (Barangay, Street) *",
+                 {"placeholder": "e.g., Poblacion, Cantilan, Surigao del Sur"}),
+                ("specific_address", st.text_input, "Specific Address / Landmark", {}),
+            ], [
+                ("property_size", st.text_input, "Property Size (e.g., 150 sqm)", {}),
+                ("year_residency", st.number_input, "Year of Residency",
+                 {"min_value": 1900, "max_value": CURRENT_YEAR, "value": 2020}),
+            ]),
+        ],
+        "footer": [],
+        "required": ["username", "password", "name", "mobile", "property_address"],
+    },
+    "rescuer": {
+        "header": "🚑 Emergency Responder Registration",
+        "intro": "Register as a first responder or emergency personnel",
+        "account": "Responder",
+        "sections": [
+            ("Personal Information", [
+                USERNAME_FIELD,
+                PASSWORD_FIELD,
+                NAME_FIELD,
+                MOBILE_FIELD,
+            ], [
+                ("position", st.selectbox, "Position/Rank *", {"options": [
+                    "Police Officer", "Firefighter", "Paramedic", "EMT", "Doctor", "Nurse",
+                    "Search & Rescue", "Volunteer", "Other"]}),
+                ("specialization", st.text_input, "Specialization (e.g., Water Rescue, Medical)", {}),
+            ]),
+            ("Organization Details", [
+                ("property_address", st.text_input, "Base Address *", {"placeholder": "e.g., Municipal Hall, Cantilan"}),
+                ("work", st.text_input, "Organization/Unit *", {"placeholder": "e.g., BFP Cantilan, PNP Station"}),
+                ("department", st.text_input, "Department/Section", {}),
+            ], [
+                ("equipment", st.text_area, "Equipment/Skills", {"placeholder": "e.g., First Aid, Fire Truck, Boat"}),
+                ("clearance_level", st.selectbox, "Clearance Level", {"options": [
+                    "Basic", "Intermediate", "Advanced", "Command", "Not Specified"]}),
+            ]),
+        ],
+        "footer": [],
+        "required": ["username", "password", "name", "mobile", "position", "work", "property_address"],
+    },
+    "government": {
+        "header": "🏛️ Government Official Registration",
+        "intro": "Register as a government officer or department representative",
+        "account": "Government",
+        "sections": [
+            ("Official Information", [
+                USERNAME_FIELD,
+                PASSWORD_FIELD,
+                NAME_FIELD,
+                MOBILE_FIELD,
+            ], [
+                ("position", st.text_input, "Official Position *",
+                 {"placeholder": "e.g., DRRMO Officer, Mayor, Councilor"}),
+                ("department", st.text_input, "Department/Office *",
+                 {"placeholder": "e.g., Mayor's Office, DRRMO, Health Office"}),
+            ]),
+            ("Government Details", [
+                ("property_address", st.text_input, "Office Address *", {"placeholder": "e.g., Municipal Hall, Cantilan"}),
+                ("work", st.text_input, "Specific Unit/Section",
+                 {"placeholder": "e.g., Operations, Planning, Administration"}),
+                ("clearance_level", st.selectbox, "Security Clearance", {"options": [
+                    "Public", "Internal", "Confidential", "Restricted", "Secret"]}),
+            ], [
+                ("specialization", st.text_area, "Responsibilities/Expertise",
+                 {"placeholder": "e.g., Disaster Response, Health Services, Infrastructure"}),
+            ]),
+        ],
+        "footer": [],
+        "required": ["username", "password", "name", "mobile", "position", "department", "property_address"],
+    },
+    "admin": {
+        "header": "🛠️ System Administrator Registration",
+        "intro": "Register as a system administrator (requires verification)",
+        "account": "Administrator",
+        "sections": [
+            ("Administrator Information", [
+                USERNAME_FIELD,
+                PASSWORD_FIELD,
+                NAME_FIELD,
+            ], [
+                MOBILE_FIELD,
+                ("admin_privileges", st.selectbox, "Admin Level *", {"options": [
+                    "Full System Admin", "User Management", "Data Management", "Monitor Only"]}),
+            ]),
+            ("Administrative Details", [
+                ("property_address", st.text_input, "Office Address", {"placeholder": "e.g., Municipal Hall, Cantilan"}),
+                ("position", st.text_input, "IT Position *",
+                 {"placeholder": "e.g., System Administrator, IT Manager"}),
+                ("department", st.text_input, "IT Department *", {"placeholder": "e.g., MIS, ICT Office"}),
+            ], [
+                ("work", st.text_input, "Specific Role", {"placeholder": "e.g., Database Admin, Network Admin"}),
+                ("clearance_level", st.selectbox, "System Access Level", {"options": [
+                    "Full Access", "User Management", "Data Access", "Read Only"]}),
+            ]),
+            ("Verification", [
+                ("verification_code", st.text_input, "Verification Code *",
+                 {"placeholder": "Contact system owner for code"}),
+            ], None),
+        ],
+        "footer": [
+            ("confirm_password", st.text_input, "Confirm Password *", {"type": "password"}),
+        ],
+        "required": ["username", "password", "name", "mobile", "position", "department", "verification_code"],
+    },
+}
 
-def page_signup_admin():
-    st.header("🛠️ System Administrator Registration")
-    st.markdown("Register as a system administrator (requires verification)")
+ADMIN_VERIFICATION_CODE = "admin"
+
+def render_signup_fields(fields, values: dict):
+    """Render signup widgets, storing their values by user key"""
+    for key, widget, label, kwargs in fields:
+        values[key] = widget(label, **kwargs)
+
+def render_signup(role: str):
+    """Render the registration form for a role"""
+    config = ROLE_CONFIGS[role]
+    st.header(config["header"])
+    st.markdown(config["intro"])
     
     # Registration form
-    with st.form("signup_admin", clear_on_submit=True):
-        st.subheader("Administrator Information")
-        col1, col2 = st.columns(2)
-        with col1:
-            username = st.text_input("Username *")
-            password = st.text_input("Password *", type="password")
-            name = st.text_input("Full Name *")
-        with col2:
-            mobile = st.text_input("Mobile Number *")
-            admin_privileges = st.selectbox("Admin Level *", 
-                ["Full System Admin", "User Management", "Data Management", "Monitor Only"])
-        
-        st.subheader("Administrative Details")
-        col3, col4 = st.columns(2)
-        with col3:
-            office_address = st.text_input("Office Address", placeholder="e.g., Municipal Hall, Cantilan")
-            position = st.text_input("IT Position *", placeholder="e.g., System Administrator, IT Manager")
-            department = st.text_input("IT Department *", placeholder="e.g., MIS, ICT Office")
-        with col4:
-            work = st.text_input("Specific Role", placeholder="e.g., Database Admin, Network Admin")
-            clearance_level = st.selectbox("System Access Level", 
-                ["Full Access", "User Management", "Data Access", "Read Only"])
-        
-        st.subheader("Verification")
-        verification_code = st.text_input("Verification Code *", 
-            placeholder="Contact system owner for code")
+    with st.form(f"signup_{role}", clear_on_submit=True):
+        values = {}
+        for subheader, left_fields, right_fields in config["sections"]:
+            st.subheader(subheader)
+            if right_fields is None:
+                render_signup_fields(left_fields, values)
+                continue
+            col1, col2 = st.columns(2)
+            with col1:
+                render_signup_fields(left_fields, values)
+            with col2:
+                render_signup_fields(right_fields, values)
         
         st.markdown("**Required fields*")
+        render_signup_fields(config["footer"], values)
         
-        # Add password confirmation
-        confirm_password = st.text_input("Confirm Password *", type="password")
-        
-        submitted = st.form_submit_button("Create Administrator Account")
+        submitted = st.form_submit_button(f"Create {config['account']} Account")
         
         if submitted:
-            if not all([username, password, name, mobile, position, department, verification_code]):
+            if not all(values[key] for key in config["required"]):
                 st.error("Please fill all required fields (*)")
-            elif password != confirm_password:
+            elif "confirm_password" in values and values["password"] != values["confirm_password"]:
                 st.error("Passwords do not match!")
-            elif get_user_by_username(username):
+            elif get_user_by_username(values["username"]):
                 st.error("Username already exists. Pick another.")
-            elif verification_code != "admin":  # Updated verification code
+            elif "verification_code" in values and values["verification_code"] != ADMIN_VERIFICATION_CODE:
                 st.error("Invalid verification code. Contact system administrator.")
             else:
-                user = {
-                    "role": "admin",
-                    "username": username,
-                    "password": password,
-                    "name": name,
-                    "age": None,
-                    "gender": None,
-                    "mobile": mobile,
-                    "position": position,
-                    "work": work,
-                    "family_members": None,
-                    "property_address": office_address,
-                    "specific_address": None,
-                    "property_size": None,
-                    "year_residency": None,
-                    "specialization": None,
-                    "equipment": None,
-                    "department": department,
-                    "clearance_level": clearance_level,
-                    "admin_privileges": admin_privileges,
-                }
+                user = {key: values.get(key) for key in USER_FIELDS}
+                user["role"] = role
                 add_user(user)
-                st.success("Administrator account created successfully! You can now log in.")
+                st.success(f"{config['account']} account created successfully! You can now log in.")
                 time.sleep(2)
                 st.session_state.page = "login"
                 safe_rerun()
 
+def page_signup_user():
+    render_signup("user")
+
+def page_signup_rescuer():
+    render_signup("rescuer")
+
+def page_signup_government():
+    render_signup("government")
+
+def page_signup_admin():
+    render_signup("admin")
+
 def page_login():
     st.header("🔐 Login")
     with st.form("login_form"):
@@ -786,6 +853,109 @@ def page_login():
                 safe_rerun()
 
 # ---------------- Enhanced Dashboards ----------------
+def sos_map_points(df_sos):
+    """Build map points for SOS alerts, colored by status"""
+    return pd.DataFrame({
+        "latitude": df_sos["lat"],
+        "longitude": df_sos["lon"],
+        "name": "SOS: " + df_sos["user_name"].astype(str),
+        "type": "sos",
+        "category": df_sos["category"],
+        "handled": df_sos["handled"],
+        "color": df_sos["handled"].map({True: [0, 255, 0, 160], False: [255, 0, 0, 200]}),
+    })
+
+def sos_status_table(df_sos, columns):
+    """SOS alerts as a display table with a readable status column"""
+    status = df_sos["handled"].map({True: "✅ Handled", False: "🟡 Active"})
+    return df_sos.assign(status=status)[columns]
+
+def map_df_key(map_df):
+    """Content hash of a map frame (colors follow type/handled, so they are skipped)"""
+    hashed = pd.util.hash_pandas_object(map_df.drop(columns="color"), index=False)
+    return hashlib.blake2b(hashed.to_numpy().tobytes(), digest_size=16).hexdigest()
+
+@st.cache_resource(max_entries=32, show_spinner=False)
+def build_map_deck(map_key, _map_df, center_lat, center_lon, radius, tooltip_html):
+    """Build a dashboard map deck, reused while the map frame is unchanged (do not modify)"""
+    view_state = pdk.ViewState(
+        latitude=center_lat,
+        longitude=center_lon,
+        zoom=13,
+        pitch=0
+    )
+    
+    layer = pdk.Layer(
+        "ScatterplotLayer",
+        data=_map_df,
+        get_position='[longitude, latitude]',
+        get_radius=radius,
+        get_fill_color='color',
+        pickable=True,
+        auto_highlight=True
+    )
+    
+    tooltip = {
+        "html": tooltip_html,
+        "style": {"backgroundColor": "steelblue", "color": "white"}
+    }
+    
+    return pdk.Deck(
+        map_style="mapbox://styles/mapbox/light-v9",
+        initial_view_state=view_state,
+        layers=[layer],
+        tooltip=tooltip
+    )
+
+def render_dashboard_map(map_df, center_lat, center_lon, radius, tooltip_html):
+    """Render a dashboard map, using the lighter st.map when there are only a couple of points"""
+    if len(map_df) <= 2:
+        st.map(map_df[["latitude", "longitude", "color"]], color="color", size=radius, zoom=13)
+    else:
+        st.pydeck_chart(build_map_deck(
+            map_df_key(map_df), map_df, center_lat, center_lon, radius, tooltip_html
+        ))
+
+def render_emergency_map(user):
+    """Citizen map of SOS alerts and hotlines"""
+    df_sos = get_active_sos()
+    
+    # Create map data
+    frames = []
+    
+    # Add user's location
+    frames.append(pd.DataFrame([{
+        "latitude": user.get("latitude"),
+        "longitude": user.get("longitude"),
+        "name": "Your Location",
+        "type": "user",
+        "color": [0, 100, 255, 200]
+    }]))
+    
+    # Add SOS alerts
+    if not df_sos.empty:
+        frames.append(sos_map_points(df_sos))
+    
+    # Add hotlines
+    frames.append(get_hotline_map_df())
+    
+    map_df = pd.concat(frames, ignore_index=True)
+    
+    render_dashboard_map(map_df, user.get("latitude"), user.get("longitude"),
+                         150, "<b>{name}</b><br>Type: {type}")
+
+def render_community_alerts():
+    """Latest community SOS alerts"""
+    df_sos = get_active_sos()
+    if df_sos.empty:
+        st.info("No active emergency alerts in the community.")
+    else:
+        st.dataframe(
+            sos_status_table(df_sos.head(5), ["timestamp", "category", "user_name", "note", "address", "status"]),
+            use_container_width=True,
+            hide_index=True
+        )
+
 def user_dashboard(user):
     st.title(f"👤 Citizen Dashboard")
     st.markdown(f"### Welcome, {user.get('name') or user.get('username')}!")
@@ -830,7 +1000,7 @@ def user_dashboard(user):
         col1, col2 = st.columns([2, 3])
         with col1:
             note = st.text_area("Emergency Description", placeholder="What's happening? Provide details...")
-            category = st.selectbox("Emergency Type", [""] + EMERGENCY_CATEGORIES)
+            category = st.selectbox("Emergency Type", get_emergency_type_options())
             
             # Location options
             st.markdown("#### 📍 Location Options")
@@ -859,120 +1029,44 @@ def user_dashboard(user):
             
             st.markdown("---")
             st.markdown("#### 📞 Emergency Contacts")
-            for hotline in HOTLINES[:2]:
-                st.write(f"**{hotline['Name']}:** {hotline['Contact']}")
+            for line in get_hotline_lines():
+                st.write(line)
                 
             # Calculate distance to nearest responder
             if user.get("latitude") and user.get("longitude"):
-                user_coords = (user["latitude"], user["longitude"])
-                hotline_coords = get_hotline_coordinates()
-                min_distance = float('inf')
-                nearest_hotline = None
-                
-                for hotline in HOTLINES:
-                    if hotline["Address"] in hotline_coords:
-                        distance = get_distance(user_coords, hotline_coords[hotline["Address"]])
-                        if distance and distance < min_distance:
-                            min_distance = distance
-                            nearest_hotline = hotline
-                
-                if nearest_hotline and min_distance != float('inf'):
-                    st.info(f"Nearest responder: {nearest_hotline['Name']} ({min_distance:.1f} km away)")
+                nearest, distance = nearest_hotline(user["latitude"], user["longitude"])
+                st.info(f"Nearest responder: {nearest['Name']} ({distance:.1f} km away)")
         st.markdown('</div>', unsafe_allow_html=True)
     
     # Map and Recent Alerts
     col1, col2 = st.columns(2)
     with col1:
         st.markdown("### 📍 Emergency Map")
-        df_sos = get_active_sos()
-        
-        # Create map data
-        map_data = []
-        
-        # Add user's location
-        map_data.append({
+        render_emergency_map(user)
+    
+    with col2:
+        st.markdown("### 📢 Recent Community Alerts")
+        render_community_alerts()
+
+def render_response_map(user):
+    """Responder map of SOS alerts"""
+    df_sos = get_active_sos()
+    
+    if not df_sos.empty:
+        # Responder's location plus the SOS alerts
+        responder_df = pd.DataFrame([{
             "latitude": user.get("latitude"),
             "longitude": user.get("longitude"),
             "name": "Your Location",
-            "type": "user",
+            "type": "responder",
             "color": [0, 100, 255, 200]
-        })
-        
-        # Add SOS alerts
-        if not df_sos.empty:
-            for _, alert in df_sos.iterrows():
-                map_data.append({
-                    "latitude": alert["lat"],
-                    "longitude": alert["lon"],
-                    "name": f"SOS: {alert['user_name']}",
-                    "type": "sos",
-                    "category": alert.get("category", "Emergency"),
-                    "handled": alert.get("handled", False),
-                    "color": [0, 255, 0, 160] if alert.get("handled") else [255, 0, 0, 200]
-                })
-        
-        # Add hotlines
-        hotline_coords = get_hotline_coordinates()
-        for hotline in HOTLINES:
-            if hotline["Address"] in hotline_coords:
-                lat, lon = hotline_coords[hotline["Address"]]
-                map_data.append({
-                    "latitude": lat,
-                    "longitude": lon,
-                    "name": hotline["Name"],
-                    "type": "hotline",
-                    "color": [255, 165, 0, 180]
-                })
-        
-        map_df = pd.DataFrame(map_data)
-        
-        # Configure map
-        view_state = pdk.ViewState(
-            latitude=user.get("latitude"),
-            longitude=user.get("longitude"),
-            zoom=13,
-            pitch=0
-        )
-        
-        layer = pdk.Layer(
-            "ScatterplotLayer",
-            data=map_df,
-            get_position='[longitude, latitude]',
-            get_radius=150,
-            get_fill_color='color',
-            pickable=True,
-            auto_highlight=True
-        )
+        }])
+        map_df = pd.concat([responder_df, sos_map_points(df_sos)], ignore_index=True)
         
-        tooltip = {
-            "html": "<b>{name}</b><br>Type: {type}",
-            "style": {"backgroundColor": "steelblue", "color": "white"}
-        }
-        
-        deck = pdk.Deck(
-            map_style="mapbox://styles/mapbox/light-v9",
-            initial_view_state=view_state,
-            layers=[layer],
-            tooltip=tooltip
-        )
-        
-        st.pydeck_chart(deck)
-    
-    with col2:
-        st.markdown("### 📢 Recent Community Alerts")
-        df_sos = get_active_sos()
-        if df_sos.empty:
-            st.info("No active emergency alerts in the community.")
-        else:
-            for _, alert in df_sos.head(5).iterrows():
-                with st.expander(f"🚨 {alert['category'] or 'Emergency'} - {alert['timestamp']}"):
-                    st.write(f"**From:** {alert['user_name']}")
-                    st.write(f"**Note:** {alert['note']}")
-                    if 'address' in alert:
-                        st.write(f"**Location:** {alert['address']}")
-                    # Safe status check
-                    if 'handled' in alert:
-                        st.write(f"**Status:** {'✅ Handled' if alert['handled'] else '🟡 Active'}")
+        render_dashboard_map(map_df, user.get("latitude"), user.get("longitude"),
+                             200, "<b>{name}</b><br>Type: {type}<br>Category: {category}")
+    else:
+        st.info("No active emergencies to display on map.")
 
 def rescuer_dashboard(user):
     st.title(f"🚑 Responder Dashboard")
@@ -1011,118 +1105,47 @@ def rescuer_dashboard(user):
     if df_sos.empty:
         st.info("No active emergencies. Stay alert!")
     else:
-        # Calculate distances for each alert
-        responder_coords = (user.get("latitude"), user.get("longitude"))
+        # Calculate distances for all alerts at once and sort by distance
+        distances = haversine_vec(user["latitude"], user["longitude"],
+                                  df_sos["lat"].to_numpy(), df_sos["lon"].to_numpy())
+        df_sos = df_sos.assign(distance=distances).sort_values("distance", kind="stable")
         
-        alerts_with_distance = []
-        for _, alert in df_sos.iterrows():
-            alert_coords = (alert["lat"], alert["lon"])
-            distance = get_distance(responder_coords, alert_coords)
-            alerts_with_distance.append((alert, distance))
+        handled_mask = df_sos["handled"].to_numpy()
+        unresolved_alerts = df_sos[~handled_mask]
+        resolved_alerts = df_sos[handled_mask]
         
-        # Sort by distance
-        alerts_with_distance.sort(key=lambda x: x[1] if x[1] is not None else float('inf'))
-        
-        # Safe filtering for unresolved alerts
-        unresolved_alerts = [alert_tuple for alert_tuple in alerts_with_distance 
-                           if not alert_tuple[0].get('handled', False)]
-        resolved_alerts = [alert_tuple for alert_tuple in alerts_with_distance 
-                          if alert_tuple[0].get('handled', False)]
-        
-        if unresolved_alerts:
+        if not unresolved_alerts.empty:
             st.markdown(f"#### 🟡 Active ({len(unresolved_alerts)})")
-            for alert_tuple in unresolved_alerts[:5]:  # Show closest 5
-                alert, distance = alert_tuple
+            for alert in unresolved_alerts.head(5).itertuples(index=False):  # Show closest 5
                 with st.container():
                     st.markdown('<div class="role-specific">', unsafe_allow_html=True)
                     col1, col2 = st.columns([3, 1])
                     with col1:
-                        st.markdown(f"**🚨 {alert.get('category', 'Emergency')}**")
-                        st.write(f"**From:** {alert.get('user_name', 'Unknown')} | **Time:** {alert.get('timestamp', 'Unknown')}")
-                        if 'address' in alert:
-                            st.write(f"**Location:** {alert['address']}")
-                        if distance is not None:
-                            st.write(f"**Distance:** {distance:.1f} km")
-                        if alert.get('note'):
-                            st.write(f"**Details:** {alert['note']}")
+                        st.markdown(f"**🚨 {alert.category}**")
+                        st.write(f"**From:** {alert.user_name} | **Time:** {alert.timestamp}")
+                        st.write(f"**Location:** {alert.address}")
+                        st.write(f"**Distance:** {alert.distance:.1f} km")
+                        if alert.note:
+                            st.write(f"**Details:** {alert.note}")
                     with col2:
-                        if st.button(f"Mark Handled", key=f"handle_{alert.get('id', 'unknown')}"):
-                            mark_sos_handled(int(alert.get('id', 0)))
-                            st.success(f"Emergency {alert.get('id', 'unknown')} marked as handled.")
+                        if st.button(f"Mark Handled", key=f"handle_{alert.id}"):
+                            mark_sos_handled(int(alert.id))
+                            st.success(f"Emergency {alert.id} marked as handled.")
                             safe_rerun()
                     st.markdown('</div>', unsafe_allow_html=True)
         
-        if resolved_alerts:
+        if not resolved_alerts.empty:
             st.markdown(f"#### ✅ Resolved ({len(resolved_alerts)})")
-            for alert_tuple in resolved_alerts[:3]:
-                alert, distance = alert_tuple
-                with st.expander(f"✅ {alert.get('category', 'Emergency')} - {alert.get('timestamp', 'Unknown')} ({distance:.1f if distance else '?'} km)"):
-                    st.write(f"**From:** {alert.get('user_name', 'Unknown')}")
-                    st.write(f"**Note:** {alert.get('note', 'No details')}")
+            st.dataframe(
+                sos_status_table(resolved_alerts.head(3), ["timestamp", "category", "user_name", "note", "distance", "status"]),
+                use_container_width=True,
+                hide_index=True,
+                column_config={"distance": st.column_config.NumberColumn("distance", format="%.1f km")}
+            )
     
     # Enhanced Emergency Map
     st.markdown("### 📍 Response Map")
-    df_sos = get_active_sos()
-    
-    if not df_sos.empty:
-        # Create map data
-        map_data = []
-        
-        # Add responder's location
-        map_data.append({
-            "latitude": user.get("latitude"),
-            "longitude": user.get("longitude"),
-            "name": "Your Location",
-            "type": "responder",
-            "color": [0, 100, 255, 200]
-        })
-        
-        # Add SOS alerts
-        for _, alert in df_sos.iterrows():
-            map_data.append({
-                "latitude": alert["lat"],
-                "longitude": alert["lon"],
-                "name": f"SOS: {alert['user_name']}",
-                "type": "sos",
-                "category": alert.get("category", "Emergency"),
-                "handled": alert.get("handled", False),
-                "color": [0, 255, 0, 160] if alert.get("handled") else [255, 0, 0, 200]
-            })
-        
-        map_df = pd.DataFrame(map_data)
-        
-        view_state = pdk.ViewState(
-            latitude=user.get("latitude"),
-            longitude=user.get("longitude"),
-            zoom=13,
-            pitch=0
-        )
-        
-        layer = pdk.Layer(
-            "ScatterplotLayer",
-            data=map_df,
-            get_position='[longitude, latitude]',
-            get_radius=200,
-            get_fill_color='color',
-            pickable=True,
-            auto_highlight=True
-        )
-        
-        tooltip = {
-            "html": "<b>{name}</b><br>Type: {type}<br>Category: {category}",
-            "style": {"backgroundColor": "steelblue", "color": "white"}
-        }
-        
-        deck = pdk.Deck(
-            map_style="mapbox://styles/mapbox/light-v9",
-            initial_view_state=view_state,
-            layers=[layer],
-            tooltip=tooltip
-        )
-        
-        st.pydeck_chart(deck)
-    else:
-        st.info("No active emergencies to display on map.")
+    render_response_map(user)
 
 def government_dashboard(user):
     st.title(f"🏛️ Government Dashboard")
@@ -1183,12 +1206,11 @@ def government_dashboard(user):
         if df_reports.empty:
             st.info("No official reports yet.")
         else:
-            for _, report in df_reports.head(5).iterrows():
-                with st.expander(f"📄 {report['category']} - {report['timestamp']}"):
-                    st.write(f"**By:** {report['reporter_name']}")
-                    st.write(f"**Description:** {report['description']}")
-                    if 'address' in report:
-                        st.write(f"**Location:** {report['address']}")
+            for report in df_reports.head(5).itertuples(index=False):
+                with st.expander(f"📄 {report.category} - {report.timestamp}"):
+                    st.write(f"**By:** {report.reporter_name}")
+                    st.write(f"**Description:** {report.description}")
+                    st.write(f"**Location:** {report.address}")
     
     with col2:
         st.markdown("### 🚨 Recent SOS Alerts")
@@ -1203,20 +1225,167 @@ def government_dashboard(user):
                 st.info("No category data available.")
             
             st.markdown("#### Recent Activity")
-            for _, alert in df_sos.head(3).iterrows():
-                # Safe status check
-                if 'handled' in alert:
-                    status = "✅" if alert['handled'] else "🟡"
+            for alert in df_sos.head(3).itertuples(index=False):
+                status = "✅" if alert.handled else "🟡"
+                st.write(f"{status} **{alert.category}** - {alert.timestamp[11:16]}")
+                st.caption(f"Location: {alert.address}")
+
+def display_dataframe_quickly(df, key: str, max_rows: int = 1000, **kwargs):
+    """Show a dataframe, paging through it with a slider once it exceeds max_rows"""
+    if len(df) > max_rows:
+        start = st.slider("Start row", 0, len(df) - max_rows, key=key)
+        st.caption(f"Showing rows {start + 1}–{start + max_rows} of {len(df)}")
+        df = df.iloc[start:start + max_rows]
+    st.dataframe(df, use_container_width=True, **kwargs)
+
+# Rows converted per CSV write. This bounds each Arrow/string conversion, not the
+# output: the finished CSV is still held in memory (and copied once into bytes)
+CSV_CHUNK_ROWS = 50_000
+
+def dataframe_to_csv_bytes(df) -> bytes:
+    """Encode a DataFrame as UTF-8 CSV in row chunks, using pyarrow's writer when available"""
+    # Write parsed timestamps back in the stored now_str() format
+    datetime_cols = df.select_dtypes("datetime").columns
+    if len(datetime_cols):
+        df = df.assign(**{col: df[col].dt.strftime("%Y-%m-%d %H:%M:%S") for col in datetime_cols})
+    
+    if pa is not None:
+        try:
+            buf = io.BytesIO()
+            schema = pa.Schema.from_pandas(df, preserve_index=False)
+            with pacsv.CSVWriter(buf, schema) as writer:
+                for start in range(0, len(df), CSV_CHUNK_ROWS):
+                    chunk = df.iloc[start:start + CSV_CHUNK_ROWS]
+                    writer.write_table(pa.Table.from_pandas(chunk, schema=schema, preserve_index=False))
+            return buf.getvalue()
+        except (ValueError, TypeError):
+            # Mixed-type object columns can't be converted to Arrow
+            pass
+    buf = io.BytesIO()
+    df.to_csv(buf, index=False, chunksize=CSV_CHUNK_ROWS, encoding="utf-8")
+    return buf.getvalue()
+
+def dataframe_to_parquet_bytes(df) -> Optional[bytes]:
+    """Encode a DataFrame as zstd-compressed Parquet (None if it can't be converted)"""
+    try:
+        buf = io.BytesIO()
+        df.to_parquet(buf, engine="pyarrow", compression="zstd", index=False)
+        return buf.getvalue()
+    except (ValueError, TypeError):
+        return None
+
+@st.fragment
+def user_accounts_fragment(user):
+    """Admin user table, account deletion and export; reruns on its own"""
+    df_users = get_all_users_df()
+    
+    # Enhanced user table with location info
+    st.markdown("#### User Accounts")
+    
+    # Project the display columns, with location info where available
+    display_df = get_display_df("users", df_users, lambda df: df.reindex(columns=[
+        'id', 'username', 'name', 'role', 'mobile', 'position',
+        'department', 'registered_on', 'property_address'
+    ]).rename(columns={'property_address': 'address'}))
+    display_dataframe_quickly(display_df, "users_start", hide_index=True)
+    
+    st.markdown("#### 🔧 Account Management")
+    col1, col2 = st.columns(2)
+    with col1:
+        user_id_to_delete = st.number_input("Enter User ID to delete", min_value=1, step=1)
+        if st.button("🗑️ Delete User", type="secondary"):
+            if user_id_to_delete > 0:
+                if int(user_id_to_delete) not in st.session_state.users_by_id:
+                    st.error(f"User {user_id_to_delete} not found.")
+                elif user_id_to_delete == user.get('id'):
+                    st.error("You cannot delete your own account!")
+                else:
+                    delete_user_by_id(int(user_id_to_delete))
+                    st.success(f"User {user_id_to_delete} deleted successfully.")
+                    safe_rerun()
+    with col2:
+        st.markdown("#### 📊 Data Export")
+        if st.button("📥 Export Users CSV"):
+            csv = dataframe_to_csv_bytes(df_users)
+            st.download_button("Download CSV", csv, "cantilan_users.csv", "text/csv")
+        if pa is not None and st.button("📥 Export Users Parquet"):
+            parquet = dataframe_to_parquet_bytes(df_users)
+            if parquet is None:
+                st.warning("User data could not be converted to Parquet; use the CSV export.")
+            else:
+                st.download_button("Download Parquet", parquet, "cantilan_users.parquet",
+                                   "application/octet-stream")
+
+@st.fragment
+def sos_monitor_fragment():
+    """Admin SOS alert table; reruns on its own"""
+    df_sos = get_active_sos()
+    st.markdown("#### 🚨 Recent SOS Alerts")
+    if df_sos.empty:
+        st.info("No SOS alerts in system.")
+    else:
+        # Project the display columns, with addresses as location
+        display_df = get_display_df("sos", df_sos, lambda df: df.reindex(columns=[
+            'id', 'user_name', 'timestamp', 'category', 'handled', 'address'
+        ]).rename(columns={'address': 'location'}))
+        display_dataframe_quickly(display_df, "sos_start", hide_index=True)
+
+@st.fragment
+def reports_monitor_fragment():
+    """Admin official reports table; reruns on its own"""
+    df_reports = get_reports_df()
+    st.markdown("#### 📄 Recent Reports")
+    if df_reports.empty:
+        st.info("No official reports.")
+    else:
+        # Project the display columns, with addresses as location
+        display_df = get_display_df("reports", df_reports, lambda df: df.reindex(columns=[
+            'id', 'reporter_name', 'timestamp', 'category', 'address'
+        ]).rename(columns={'address': 'location'}))
+        display_dataframe_quickly(display_df, "reports_start", hide_index=True)
+
+@st.fragment
+def user_registry_fragment():
+    """Admin complete user registry and statistics; reruns on its own"""
+    df_users = get_all_users_df()
+    if not df_users.empty:
+        st.markdown("#### All Registered Users (Detailed View)")
+        
+        display_dataframe_quickly(df_users, "registry_start")
+        
+        # Summary statistics
+        st.markdown("#### 📈 User Statistics")
+        col1, col2 = st.columns(2)
+        
+        with col1:
+            st.markdown("**Role Distribution**")
+            # Kept up to date by add_user/delete_user_by_id, so nothing to count here
+            role_dist = pd.Series(dict((+st.session_state.role_counts).most_common()), name="count")
+            role_dist.index.name = "role"
+            st.table(role_dist)
+        
+        with col2:
+            st.markdown("**Registration Timeline**")
+            if 'registered_on' in df_users.columns:
+                reg_timeline = df_users.set_index('registered_on').resample('D').size()
+                reg_timeline = reg_timeline[reg_timeline > 0].rename("count")
+                reg_timeline.index = pd.Index(reg_timeline.index.date, name="registered_on")
+                if not reg_timeline.empty:
+                    st.table(reg_timeline)
                 else:
-                    status = "🟡"
-                location_info = alert.get('address', 'Location not available')
-                st.write(f"{status} **{alert.get('category', 'Emergency')}** - {alert['timestamp'][11:16]}")
-                st.caption(f"Location: {location_info}")
+                    st.info("No registration date data.")
+            else:
+                st.info("Registration dates not available.")
+    else:
+        st.info("No users registered in the system.")
 
 def admin_dashboard(user):
     st.title("🛠️ System Administration")
     st.markdown(f"### Welcome, System Administrator {user.get('name')}!")
     
+    df_users = get_all_users_df()
+    df_reports = get_reports_df()
+    
     # Admin Info Card
     with st.container():
         st.markdown('<div class="dashboard-card">', unsafe_allow_html=True)
@@ -1233,206 +1402,75 @@ def admin_dashboard(user):
             st.write(f"**Access Level:** {user.get('clearance_level')}")
         with col3:
             st.markdown("#### 📈 System Stats")
-            df_users = get_all_users_df()
-            df_sos = get_active_sos()
             st.write(f"**Total Users:** {len(df_users)}")
-            
-            # Safe count of active alerts
-            if not df_sos.empty and 'handled' in df_sos.columns:
-                active_alerts = len(df_sos[df_sos['handled'] == False])
-            else:
-                active_alerts = 0
-            st.write(f"**Active Alerts:** {active_alerts}")
-            
-            st.write(f"**Total Reports:** {len(get_reports_df())}")
+            st.write(f"**Active Alerts:** {st.session_state.active_sos_count}")
+            st.write(f"**Total Reports:** {len(df_reports)}")
         st.markdown('</div>', unsafe_allow_html=True)
     
     # User Management with location info
     st.markdown("### 👥 User Management")
-    df_users = get_all_users_df()
     
     if df_users.empty:
         st.info("No registered users.")
     else:
         # User statistics
         col1, col2, col3, col4 = st.columns(4)
-        role_counts = df_users['role'].value_counts()
+        role_counts = st.session_state.role_counts
         with col1:
-            st.metric("Citizens", role_counts.get('user', 0))
+            st.metric("Citizens", role_counts["user"])
         with col2:
-            st.metric("Responders", role_counts.get('rescuer', 0))
+            st.metric("Responders", role_counts["rescuer"])
         with col3:
-            st.metric("Government", role_counts.get('government', 0))
+            st.metric("Government", role_counts["government"])
         with col4:
-            st.metric("Admins", role_counts.get('admin', 0))
-        
-        # Enhanced user table with location info
-        st.markdown("#### User Accounts")
-        
-        # Create display dataframe with location info
-        display_data = []
-        for _, user_row in df_users.iterrows():
-            user_info = {
-                'id': user_row.get('id'),
-                'username': user_row.get('username'),
-                'name': user_row.get('name'),
-                'role': user_row.get('role'),
-                'mobile': user_row.get('mobile'),
-                'position': user_row.get('position'),
-                'department': user_row.get('department'),
-                'registered_on': user_row.get('registered_on')
-            }
-            # Add location info if available
-            if user_row.get('property_address'):
-                user_info['address'] = user_row.get('property_address')
-            
-            display_data.append(user_info)
-        
-        display_df = pd.DataFrame(display_data)
-        st.dataframe(display_df, use_container_width=True)
+            st.metric("Admins", role_counts["admin"])
         
-        st.markdown("#### 🔧 Account Management")
-        col1, col2 = st.columns(2)
-        with col1:
-            user_id_to_delete = st.number_input("Enter User ID to delete", min_value=1, step=1)
-            if st.button("🗑️ Delete User", type="secondary"):
-                if user_id_to_delete > 0:
-                    if user_id_to_delete == user.get('id'):
-                        st.error("You cannot delete your own account!")
-                    else:
-                        delete_user_by_id(int(user_id_to_delete))
-                        st.success(f"User {user_id_to_delete} deleted successfully.")
-                        safe_rerun()
-        with col2:
-            st.markdown("#### 📊 Data Export")
-            if st.button("📥 Export Users CSV"):
-                csv = df_users.to_csv(index=False).encode("utf-8")
-                st.download_button("Download CSV", csv, "cantilan_users.csv", "text/csv")
+        user_accounts_fragment(user)
     
     # System Monitoring with enhanced location info
     st.markdown("### 📊 System Monitoring")
     col1, col2 = st.columns(2)
     
     with col1:
-        st.markdown("#### 🚨 Recent SOS Alerts")
-        df_sos = get_active_sos()
-        if df_sos.empty:
-            st.info("No SOS alerts in system.")
-        else:
-            # Enhanced display with addresses
-            display_data = []
-            for _, alert in df_sos.iterrows():
-                alert_info = {
-                    'id': alert.get('id'),
-                    'user_name': alert.get('user_name'),
-                    'timestamp': alert.get('timestamp'),
-                    'category': alert.get('category'),
-                    'handled': alert.get('handled', False)
-                }
-                if 'address' in alert:
-                    alert_info['location'] = alert['address']
-                display_data.append(alert_info)
-            
-            display_df = pd.DataFrame(display_data)
-            st.dataframe(display_df, use_container_width=True)
+        sos_monitor_fragment()
     
     with col2:
-        st.markdown("#### 📄 Recent Reports")
-        df_reports = get_reports_df()
-        if df_reports.empty:
-            st.info("No official reports.")
-        else:
-            # Enhanced display with addresses
-            display_data = []
-            for _, report in df_reports.iterrows():
-                report_info = {
-                    'id': report.get('id'),
-                    'reporter_name': report.get('reporter_name'),
-                    'timestamp': report.get('timestamp'),
-                    'category': report.get('category')
-                }
-                if 'address' in report:
-                    report_info['location'] = report['address']
-                display_data.append(report_info)
-            
-            display_df = pd.DataFrame(display_data)
-            st.dataframe(display_df, use_container_width=True)
+        reports_monitor_fragment()
     
     # Complete User Registry Table
     st.markdown("### 📋 Complete User Registry")
-    if not df_users.empty:
-        st.markdown("#### All Registered Users (Detailed View)")
-        
-        # Show all available columns except password, include location info
-        columns_to_show = [col for col in df_users.columns if col != 'password']
-        
-        if columns_to_show:
-            st.dataframe(df_users[columns_to_show], use_container_width=True)
-            
-            # Summary statistics
-            st.markdown("#### 📈 User Statistics")
-            col1, col2 = st.columns(2)
-            
-            with col1:
-                st.markdown("**Role Distribution**")
-                role_dist = df_users['role'].value_counts()
-                st.dataframe(role_dist, use_container_width=True)
-            
-            with col2:
-                st.markdown("**Registration Timeline**")
-                if 'registered_on' in df_users.columns:
-                    try:
-                        reg_dates = pd.to_datetime(df_users['registered_on']).dt.date
-                        reg_timeline = reg_dates.value_counts().sort_index()
-                        if not reg_timeline.empty:
-                            st.dataframe(reg_timeline, use_container_width=True)
-                        else:
-                            st.info("No registration date data.")
-                    except Exception as e:
-                        st.info(f"Could not process registration dates: {e}")
-                else:
-                    st.info("Registration dates not available.")
-        else:
-            st.info("No user data available for display.")
-    else:
-        st.info("No users registered in the system.")
+    user_registry_fragment()
 
 # ---------------- Router ----------------
+PUBLIC_PAGES = {
+    "home": page_home,
+    "about": page_about,
+    "signup_role": page_signup_role,
+    "signup_user": page_signup_user,
+    "signup_rescuer": page_signup_rescuer,
+    "signup_government": page_signup_government,
+    "signup_admin": page_signup_admin,
+    "login": page_login,
+}
+
+ROLE_DASHBOARDS = {
+    "user": user_dashboard,
+    "rescuer": rescuer_dashboard,
+    "government": government_dashboard,
+    "admin": admin_dashboard,
+}
+
+def unknown_role_dashboard(user):
+    st.error("Unknown user role. Please contact system administrator.")
+
 def main_router():
     # Show role-based dashboard if logged in
-    if st.session_state.current_user:
-        role = st.session_state.current_user.get("role")
-        
-        if role == "user":
-            user_dashboard(st.session_state.current_user)
-        elif role == "rescuer":
-            rescuer_dashboard(st.session_state.current_user)
-        elif role == "government":
-            government_dashboard(st.session_state.current_user)
-        elif role == "admin":
-            admin_dashboard(st.session_state.current_user)
-        else:
-            st.error("Unknown user role. Please contact system administrator.")
+    user = st.session_state.current_user
+    if user:
+        ROLE_DASHBOARDS.get(user.get("role"), unknown_role_dashboard)(user)
     else:
         # Show public pages if not logged in
-        if st.session_state.page == "home":
-            page_home()
-        elif st.session_state.page == "about":
-            page_about()
-        elif st.session_state.page == "signup_role":
-            page_signup_role()
-        elif st.session_state.page == "signup_user":
-            page_signup_user()
-        elif st.session_state.page == "signup_rescuer":
-            page_signup_rescuer()
-        elif st.session_state.page == "signup_government":
-            page_signup_government()
-        elif st.session_state.page == "signup_admin":
-            page_signup_admin()
-        elif st.session_state.page == "login":
-            page_login()
-        else:
-            page_home()
+        PUBLIC_PAGES.get(st.session_state.page, page_home)()
 
 # ---------------- Run app ----------------
 if __name__ == "__main__":